@@ -0,0 +1,33 @@
+"""
+Handler lookup that is done for every request. It's kept apart from
+dispatcher's classes, so it may be compiled with mypyc (see setup.py),
+while the classes stay usual python ones, that can be subclassed
+and extended by users
+"""
+
+from typing import Dict, Optional, TypeVar
+
+from ..typehints import HTTPMethod
+
+HandlerT = TypeVar('HandlerT')
+
+
+def pick_handler(usual_handlers: Dict[bytes, Dict[HTTPMethod, HandlerT]],
+                 any_paths_handlers: Dict[HTTPMethod, Optional[HandlerT]],
+                 path: bytes,
+                 method: HTTPMethod) -> Optional[HandlerT]:
+    """
+    Returns handler of the path for the method, otherwise any-path
+    handler for the method. Unknown methods just have no handlers
+    instead of raising KeyError
+    """
+
+    path_handlers = usual_handlers.get(path)
+
+    if path_handlers is not None:
+        handler = path_handlers.get(method)
+
+        if handler is not None:
+            return handler
+
+    return any_paths_handlers.get(method)
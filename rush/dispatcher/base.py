@@ -1,6 +1,5 @@
 import abc
-from typing import Callable
-
+from ..typehints import HttpSend
 from ..entities import Request, Response
 
 
@@ -9,6 +8,15 @@ class BaseDispatcher(abc.ABC):
     A base class to be inherited of for all the dispatchers implementations
     """
 
+    def freeze(self):
+        """
+        Called by webserver once before serving begins (and before forking
+        workers). Dispatcher may prepare everything it won't change anymore
+        here, so workers get it already prepared
+
+        This method is optional
+        """
+
     def on_begin_serving(self):
         """
         Just a callback after server starts working. May be useful
@@ -22,7 +30,12 @@ class BaseDispatcher(abc.ABC):
     async def process_request(self,
                               request: Request,
                               response: Response,
-                              http_send: Callable[[bytes], None]) -> Response:
+                              http_send: HttpSend) -> None:
         """
         The only method we need from dispatcher
+
+        http_send() receives either rendered response as bytes, or an iterable
+        of bytes parts of it (for example, head and body), that are sent all at
+        once without concatenating them. Response must be sent by dispatcher
+        itself, returned value is ignored
         """
@@ -1,19 +1,23 @@
 import logging
 import sys
 import traceback
-from functools import reduce
+from inspect import isawaitable
 from asyncio import iscoroutinefunction
-from typing import (Dict, Callable, Awaitable, Union, Type, Iterable, List, Optional)
+from typing import (Dict, Callable, Awaitable, Union, Type, Iterable, List, Optional,
+                    FrozenSet, Sequence, Any)
 
 from .. import exceptions
 from .base import BaseDispatcher
+from ._routing import pick_handler
 from ..entities import Request, Response
 from ..middlewares.base import BaseMiddleware
 from ..utils.stringutils import make_sure_bytes_or_none
-from ..utils.httputils import HTTP_METHODS, render_http_response
-from ..typehints import RoutePath, AsyncFunction, HTTPMethod, Logger
+from ..utils.httputils import HTTP_METHODS, render_http_response, render_http_response_head
+from ..typehints import RoutePath, AsyncFunction, HTTPMethod, Logger, HttpSend
 
 ErrorHandler = Callable[[Request, Response, Exception], Awaitable[Response]]
+# handlers may be as coroutines, as usual functions
+HandlerFunction = Callable[[Request, Response], Union[Response, Awaitable[Response]]]
 PRE_RENDERED_INTERNAL_ERROR_RESPONSE = render_http_response(
     protocol=b'1.1',
     code=500,
@@ -30,54 +34,117 @@ PRE_RENDERED_NOT_FOUND = render_http_response(
 )
 
 
-def collapse_middlewares(middlewares: List[BaseMiddleware],
-                         handler: Awaitable,
-                         request: Request) -> Awaitable:
+def normalize_methods(methods: Iterable[Union[str, bytes]]) -> FrozenSet[HTTPMethod]:
     """
-    Takes a list of middlewares and a handler, and returns single coroutine
-    that is just a chain of nested calls of next middleware (or handler in
-    the end)
+    Returns upper-cased bytes methods. The set is frozen as handlers' methods
+    must not change after the handler was registered
     """
 
-    # TODO: benchmark, what is faster: given variant below,
-    #       or making the last middleware already with handler,
-    #       and collapse all them only after that
-    return reduce(
-        lambda prev, next_: next_.process(prev, request),
-        # all the middlewares `process()` method requires handler
-        # but endpoint handler doesn't. So we just put endpoint handler
-        # as the first element in the list of middlewares so we don't need
-        # to pass any arguments to it. Ez solution, but ugly for linters
-        [handler] + middlewares  # noqa
+    return frozenset(
+        (method if isinstance(method, bytes) else method.encode()).upper()
+        for method in methods
     )
 
 
+def make_async_handler(handler: Callable[[Request, Response], Any]
+                       ) -> Callable[[Request, Response], Awaitable[Response]]:
+    """
+    Middlewares await the handler, so synchronous handler with middlewares
+    is wrapped into a coroutine function
+
+    Handler that isn't a coroutine function still may return an awaitable
+    (for example, lambda that calls a coroutine function, or an object with
+    async __call__), so it's awaited in this case
+    """
+
+    async def async_handler(request: Request, response: Response) -> Response:
+        result = handler(request, response)
+
+        if isawaitable(result):
+            result = await result
+
+        return result
+
+    return async_handler
+
+
+def compose_middlewares(middlewares: Sequence[BaseMiddleware],
+                        handler: Callable[[Request, Response], Awaitable]
+                        ) -> Callable[[Request, Response], Awaitable]:
+    """
+    Takes a list of middlewares and a handler, and returns single callable
+    that returns a chain of nested calls of next middleware (or handler in
+    the end). The chain itself is built only once, so per request we create
+    only the coroutines, without re-collapsing the whole list every time
+
+    The callable is generated as a single function with all the calls inlined,
+    `process_1(process_0(handler(request, response), request), request)`,
+    so calling it costs one frame instead of a frame per middleware
+    """
+
+    namespace: Dict[str, Any] = {'handler': handler}
+    chain = 'handler(request, response)'
+
+    for index, middleware in enumerate(middlewares):
+        name = f'process_{index}'
+        namespace[name] = middleware.process
+        chain = f'{name}({chain}, request)'
+
+    source = f'def dispatch(request, response):\n    return {chain}\n'
+    exec(compile(source, f'<middlewares chain of {handler!r}>', 'exec'), namespace)
+
+    return namespace['dispatch']
+
+
 class Handler:
     """
     A class that describes handler. Keeps it routing path,
     methods, etc.
     """
 
+    # handler is looked up and its dispatch is accessed for every request,
+    # so no need to keep instance dict
+    __slots__ = ('handler', 'path', 'methods', 'any_path', 'middlewares', 'dispatch', 'is_sync')
+
     def __init__(self,
-                 handler: Callable[[Request, Response], Awaitable],
-                 path: RoutePath,
-                 methods: Iterable[bytes],
+                 handler: HandlerFunction,
+                 path: Optional[bytes],
+                 methods: FrozenSet[HTTPMethod],
                  any_path: bool,
-                 middlewares: List[BaseMiddleware]):
+                 middlewares: Sequence[BaseMiddleware]):
         self.handler = handler
         self.path = path
         self.methods = methods
         self.any_path = any_path
-        self.middlewares = middlewares or []
+        # becomes a tuple when dispatcher is frozen
+        self.middlewares: Sequence[BaseMiddleware] = middlewares or []
+
+        # handler wrapped into all its middlewares, see build_chain()
+        self.dispatch: Callable[[Request, Response], Any] = handler
+        # whether dispatch must be called without awaiting. True only for
+        # handlers without middlewares that aren't coroutine functions, as usually
+        # they just return response and there is no need to spend a coroutine and
+        # an event loop step on them. If such a handler returns an awaitable
+        # anyway, it's awaited by dispatcher
+        self.is_sync = not iscoroutinefunction(handler)
+        # built right away from handler's own middlewares, so they are applied
+        # even if dispatcher is never frozen. Freezing rebuilds the chain after
+        # global middlewares are added
+        self.build_chain()
+
+    def build_chain(self) -> None:
+        if not self.middlewares:
+            self.dispatch = self.handler
+            self.is_sync = not iscoroutinefunction(self.handler)
+            return
 
-    def get_wrapped_handler(self,
-                            request: Request,
-                            response: Response) -> Awaitable:
-        return collapse_middlewares(
-            middlewares=self.middlewares,
-            handler=self.handler(request, response),
-            request=request
-        )
+        handler: Callable[[Request, Response], Any] = self.handler
+
+        if not iscoroutinefunction(handler):
+            handler = make_async_handler(handler)
+
+        self.dispatch = compose_middlewares(self.middlewares, handler)
+        self.is_sync = False
 
 
 class Route:
@@ -86,164 +153,207 @@ class Route:
     decorators, but using dp.add_routes([...])
     """
 
+    __slots__ = ('handler', 'path', 'methods', 'middlewares')
+
     def __init__(self,
-                 handler: AsyncFunction,
+                 handler: HandlerFunction,
                  path: RoutePath,
-                 method_or_methods: Union[str, bytes, Iterable] = HTTP_METHODS,
-                 middlewares: Optional[List[BaseMiddleware]] = None):
+                 method_or_methods: Union[str, bytes, Iterable[Union[str, bytes]]] = HTTP_METHODS,
+                 middlewares: Optional[Sequence[BaseMiddleware]] = None):
         self.handler = handler
         self.path = path if isinstance(path, bytes) else path.encode()
 
-        if not isinstance(method_or_methods, Iterable):
-            method_or_methods = {method_or_methods}
-
-        self.methods = method_or_methods
+        if isinstance(method_or_methods, (str, bytes)):
+            self.methods = normalize_methods((method_or_methods,))
+        else:
+            self.methods = normalize_methods(method_or_methods)
         self.middlewares = middlewares or []
 
 
 class AsyncDispatcher(BaseDispatcher):
-    def __init__(self, logger: Logger = None):
-        if logger is None:
-            self.logger = logging.getLogger()
-        else:
-            self.logger = logger
+    def __init__(self, logger: Optional[Logger] = None):
+        self.logger: Logger = logging.getLogger() if logger is None else logger
 
-        self.usual_handlers: Dict[bytes, Handler] = {}
-        self.any_paths_handlers: Dict[HTTPMethod, Handler] = {
+        # path -> {method: handler}. Exact paths are the only kind of routes
+        # we have, so two dict probes are enough to pick a handler
+        self.usual_handlers: Dict[bytes, Dict[HTTPMethod, Handler]] = {}
+        self.any_paths_handlers: Dict[HTTPMethod, Optional[Handler]] = {
             method: None for method in HTTP_METHODS
         }
 
         # a dict with exceptions and handlers of the exceptions
         self.error_handlers: Dict[Type[Exception], ErrorHandler] = {}
 
+        # becomes a tuple when dispatcher is frozen
         self.global_middlewares: List[BaseMiddleware] = []
 
-    def on_begin_serving(self):
+        # after dispatcher is frozen, routes and middlewares can't be changed
+        # anymore, as middlewares chains are already built
+        self._frozen = False
+
+    def freeze(self):
         """
         Implicitly insert global middlewares to the list of middlewares
         of all the handlers. Inserting to the beginning as it is tenable
         for global middlewares to be first who will process the request
+
+        Handlers' middlewares become tuples, and their chains are built.
+        This may be called more than once, but middlewares are applied
+        only once
         """
 
-        for handler in self.usual_handlers.values():
+        if self._frozen:
+            return
+
+        # a tuple, so changing it after freezing fails instead of doing nothing
+        self.global_middlewares = tuple(self.global_middlewares)  # type: ignore[assignment]
+
+        for handler in self._get_all_handlers():
             self._apply_middlewares(handler, self.global_middlewares)
 
-        for handler in self.any_paths_handlers.values():
-            if handler is not None:
-                self._apply_middlewares(handler, self.global_middlewares)
+        self._rebuild_chains()
+        self._frozen = True
+
+    def on_begin_serving(self):
+        """
+        Webserver freezes the dispatcher before forking, but the server
+        may also be ran without it
+        """
+
+        self.freeze()
 
     async def process_request(self,
                               request: Request,
                               response: Response,
-                              http_send: Callable[[bytes], None]) -> None:
-        if request.path not in self.usual_handlers:
-            handler = self.any_paths_handlers[request.method]
-
-            if handler is None:
-                err_handler = self._get_error_handler(exceptions.HTTPNotFound)
-
-                if err_handler is not None:
-                    rendered_response = await self._run_exception_handler(
-                        exc_handler=err_handler,
-                        request=request,
-                        response=response,
-                        exception=exceptions.HTTPNotFound(
-                            request,
-                            msg='no handlers attached for the request'
-                        )
-                    )
-                else:
-                    rendered_response = PRE_RENDERED_INTERNAL_ERROR_RESPONSE
-                    self.logger.warning(f'{request.path.decode()}: no handlers attached')
+                              http_send: HttpSend) -> None:
+        # parser always fills path and method in before calling us
+        handler = pick_handler(
+            self.usual_handlers,
+            self.any_paths_handlers,
+            request.path,  # type: ignore[arg-type]
+            request.method  # type: ignore[arg-type]
+        )
+
+        if handler is None:
+            path_handlers = self.usual_handlers.get(request.path)  # type: ignore[arg-type]
 
-                http_send(rendered_response)
+            if path_handlers is not None:
+                # the path is known, just not for this method
+                http_send(await self._handle_exception(
+                    request, response, exceptions.HTTPMethodNotAllowed(
+                        request,
+                        msg='no handlers attached for the method',
+                        allowed_methods=frozenset(path_handlers)
+                    )
+                ))
                 return
-        else:
-            handler = self.usual_handlers[request.path]
 
-        try:
-            if handler.middlewares:
-                result = await handler.get_wrapped_handler(request, response)
+            err_handler = self._get_error_handler(exceptions.HTTPNotFound)
+
+            if err_handler is not None:
+                rendered_response = await self._run_exception_handler(
+                    exc_handler=err_handler,
+                    request=request,
+                    response=response,
+                    exception=exceptions.HTTPNotFound(
+                        request,
+                        msg='no handlers attached for the request'
+                    )
+                )
             else:
-                result = await handler.handler(request, response)
-        except Exception as exc:
-            http_send(await self._handle_exception(request, response, exc))
+                rendered_response = PRE_RENDERED_INTERNAL_ERROR_RESPONSE
+                self.logger.warning(f'{request.path!r}: no handlers attached')
+
+            http_send(rendered_response)
             return
 
-        http_send(
-            render_http_response(
+        try:
+            if handler.is_sync:
+                result = handler.dispatch(request, response)
+
+                if isawaitable(result):
+                    result = await result
+            else:
+                result = await handler.dispatch(request, response)
+
+            # rendering is also here, so if handler returned something that
+            # isn't a response, this goes to error handlers
+            body = result.body or b''
+            head = render_http_response_head(
                 protocol=b'1.1',
                 code=result.code,
                 status_code=result.status,  # status can be None
-                headers=result.headers,     # but body can't, otherwise TypeError
-                body=result.body or b'',
-                # TODO: this option shouldn't be always True, so after native chunked transfer
-                #       will be implemented this flag will become optional
-                count_content_length=True
+                headers=result.headers,
+                # TODO: content-length shouldn't be always counted, so after native chunked
+                #       transfer will be implemented this will become optional
+                content_length=len(body)
             )
-        )
+        except Exception as exc:
+            http_send(await self._handle_exception(request, response, exc))
+            return
+
+        # head and body are sent as separate parts, so body isn't copied
+        # into the rendered response, but still goes in a single syscall
+        http_send((head, body))
 
     def route(self,
-              path: RoutePath,
+              path: Optional[RoutePath],
               method: Union[str, bytes, None] = None,
-              methods: Iterable[HTTPMethod] = HTTP_METHODS,
-              middlewares: Optional[List[BaseMiddleware]] = None):
+              methods: Iterable[Union[str, bytes]] = HTTP_METHODS,
+              middlewares: Optional[Sequence[BaseMiddleware]] = None):
         if method is not None:
-            methods = {make_sure_bytes_or_none(method.upper())}
+            methods = (method,)
 
-        def deco(coro: Callable[[Request, Response], Awaitable]):
+        def deco(func: HandlerFunction):
             if not methods:
-                raise exceptions.NoMethodsProvided(str(coro))
-
-            if not iscoroutinefunction(coro):
-                raise exceptions.HandlerMustBeCoroutineError(str(coro))
+                raise exceptions.NoMethodsProvided(str(func))
 
             self._put_handler(Handler(
-                handler=coro,
+                handler=func,
                 path=make_sure_bytes_or_none(path),
-                methods=set(methods),
+                methods=normalize_methods(methods),
                 any_path=path is None,
                 middlewares=middlewares or []
             ))
 
-            return coro
+            return func
 
         return deco
 
     def get(self, path: RoutePath,
-            middlewares: Optional[List[BaseMiddleware]] = None):
+            middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'GET', middlewares=middlewares)
 
     def post(self, path: RoutePath,
-             middlewares: Optional[List[BaseMiddleware]] = None):
+             middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'POST', middlewares=middlewares)
 
     def head(self, path: RoutePath,
-             middlewares: Optional[List[BaseMiddleware]] = None):
+             middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'HEAD', middlewares=middlewares)
 
     def put(self, path: RoutePath,
-            middlewares: Optional[List[BaseMiddleware]] = None):
+            middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'PUT', middlewares=middlewares)
 
     def trace(self, path: RoutePath,
-              middlewares: Optional[List[BaseMiddleware]] = None):
+              middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'TRACE', middlewares=middlewares)
 
     def connect(self, path: RoutePath,
-                middlewares: Optional[List[BaseMiddleware]] = None):
+                middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'CONNECT', middlewares=middlewares)
 
     def delete(self, path: RoutePath,
-               middlewares: Optional[List[BaseMiddleware]] = None):
+               middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'DELETE', middlewares=middlewares)
 
     def options(self, path: RoutePath,
-                middlewares: Optional[List[BaseMiddleware]] = None):
+                middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'OPTIONS', middlewares=middlewares)
 
     def patch(self, path: RoutePath,
-              middlewares: Optional[List[BaseMiddleware]] = None):
+              middlewares: Optional[Sequence[BaseMiddleware]] = None):
         return self.route(path, 'PATCH', middlewares=middlewares)
 
     def add_routes(self, routes: Iterable[Route]):
@@ -268,6 +378,7 @@ class AsyncDispatcher(BaseDispatcher):
         return deco
 
     def add_global_middleware(self, middleware: BaseMiddleware):
+        self._ensure_not_frozen()
         self.global_middlewares.append(middleware)
 
     def add_global_middlewares(self, *middlewares: BaseMiddleware):
@@ -286,7 +397,7 @@ class AsyncDispatcher(BaseDispatcher):
                 # we can show the default error page to user
 
                 return render_http_response(
-                    protocol=request.protocol.encode(),
+                    protocol=request.protocol.encode(),  # type: ignore[union-attr]
                     code=exc.code,
                     status_code=exc.description,
                     headers=response.default_headers,
@@ -306,24 +417,30 @@ class AsyncDispatcher(BaseDispatcher):
         )
 
     def _get_error_handler(self, exc_class: Type[Exception]) -> Optional[ErrorHandler]:
+        error_handlers = self.error_handlers
+
         for exception_class in exc_class.mro():
-            if exception_class in self.error_handlers:
-                # idk why linter is yelling, as exc_class is always an exception,
-                # he is always a subclass of Exception, subclass of subclass of Exception, etc.
-                return self.error_handlers[exception_class]  # noqa
+            # idk why linter is yelling, as exc_class is always an exception,
+            # he is always a subclass of Exception, subclass of subclass of Exception, etc.
+            err_handler = error_handlers.get(exception_class)  # noqa
+
+            if err_handler is not None:
+                return err_handler
+
+        return None
 
     async def _run_exception_handler(self,
                                      exc_handler: ErrorHandler,
                                      request: Request,
                                      response: Response,
-                                     exception: Exception):
+                                     exception: Exception) -> bytes:
         try:
             result = await exc_handler(request, response, exception)
         except exceptions.HTTPError as exc:
             request = exc.request
 
             return render_http_response(
-                protocol=request.protocol,
+                protocol=request.protocol.encode(),  # type: ignore[union-attr]
                 code=exc.code,
                 status_code=exc.description,
                 headers=response.default_headers,
@@ -337,21 +454,54 @@ class AsyncDispatcher(BaseDispatcher):
         return render_http_response(
             protocol=b'1.1',
             code=result.code,
-            status_code=result.status,
+            status_code=result.status,  # type: ignore[arg-type]
             headers=result.headers,
-            body=result.body,
+            body=result.body or b'',
             count_content_length=True
         )
 
+    def _rebuild_chains(self) -> None:
+        for handler in self._get_all_handlers():
+            handler.build_chain()
+
+    def _ensure_not_frozen(self) -> None:
+        if self._frozen:
+            raise exceptions.DispatcherFrozenError(
+                'routes and middlewares can not be changed after dispatcher was frozen'
+            )
+
+    def _get_all_handlers(self) -> List[Handler]:
+        """
+        Returns every registered handler exactly once. The same handler
+        may be stored under several methods, so we can't just walk the dicts
+        """
+
+        handlers: Dict[int, Handler] = {}
+
+        for path_handlers in self.usual_handlers.values():
+            for handler in path_handlers.values():
+                handlers[id(handler)] = handler
+
+        for any_path_handler in self.any_paths_handlers.values():
+            if any_path_handler is not None:
+                handlers[id(any_path_handler)] = any_path_handler
+
+        return list(handlers.values())
+
     @staticmethod
-    def _apply_middlewares(handler: Handler, middlewares: List[BaseMiddleware]):
-        handler.middlewares.extend(middlewares)
+    def _apply_middlewares(handler: Handler, middlewares: Sequence[BaseMiddleware]):
+        handler.middlewares = (*handler.middlewares, *middlewares)
 
     def _put_handler(self, handler: Handler) -> None:
+        self._ensure_not_frozen()
+
         if handler.any_path:
             self._add_any_path_handler(handler)
         else:
-            self.usual_handlers[handler.path] = handler
+            path_handlers = self.usual_handlers.setdefault(handler.path, {})  # type: ignore[arg-type]
+
+            for method in handler.methods:
+                path_handlers[method] = handler
 
     def _add_any_path_handler(self, handler: Handler) -> None:
         for method in handler.methods:
@@ -202,10 +202,26 @@ class Response:
         self.headers: CaseInsensitiveDict = default_headers.copy()
         self.body: Optional[bytes] = None
 
+        # headers dict that belongs to this object only, so it can be
+        # refilled by wipe(). Handlers may assign any other dict to headers
+        self._headers = self.headers
+
     def wipe(self):
+        """
+        Response object lives as long as the connection does, so instead of
+        copying default headers into a new dict for every request, its own
+        dict is refilled. Keys are taken as they are, just like copy() does,
+        so there is no need to go through CaseInsensitiveDict.update()
+
+        If handler replaced headers with some other dict (for example, with
+        default headers), that dict is left untouched
+        """
+
         self.code = 200
         self.status = None
-        self.headers = self.default_headers.copy()
+        self._headers.clear()
+        dict.update(self._headers, self.default_headers)
+        self.headers = self._headers
         self.body = None
 
     def __call__(self,
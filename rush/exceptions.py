@@ -17,6 +17,10 @@ class NoMethodsProvided(WebServerError):
     pass
 
 
+class DispatcherFrozenError(WebServerError):
+    pass
+
+
 class InvalidFormBodyError(WebServerError):
     def __init__(self, body: Optional[Union[bytes, str]] = None):
         self.body = body
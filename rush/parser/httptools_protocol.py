@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional
+from typing import Optional, List
 
 from httptools import HttpRequestParser
 
@@ -16,7 +16,9 @@ class Protocol:
         self.request_obj = request_obj
 
         self.headers = self.REQUEST_HEADERS.copy()
-        self.body: bytes = b''
+        # body comes in chunks, concatenating them as bytes every time
+        # is quadratic, so they're joined only after the message is complete
+        self.body_chunks: List[bytes] = []
         self.file: bool = False
 
         self.received: bool = False
@@ -27,7 +29,7 @@ class Protocol:
         self.parser: Optional[HttpRequestParser] = None
 
     def on_message_begin(self):
-        self.body = b''
+        self.body_chunks.clear()
         self.file = False
         self.headers = self.REQUEST_HEADERS.copy()
         self.received = False
@@ -68,9 +70,14 @@ class Protocol:
         if self._on_chunk:
             asyncio.create_task(self._on_chunk(body))
         else:
-            self.request_obj.body += body
+            self.body_chunks.append(body)
 
     def on_message_complete(self):
+        if self.body_chunks:
+            # joining a single chunk doesn't copy it
+            self.request_obj.body = b''.join(self.body_chunks)
+            self.body_chunks.clear()
+
         self.received = True
 
         if self._on_complete:
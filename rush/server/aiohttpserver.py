@@ -1,7 +1,7 @@
 import socket
 import asyncio
 import warnings
-from typing import Optional, Callable, NoReturn
+from typing import Optional, Callable, Iterable, Union, NoReturn
 
 from httptools import HttpRequestParser
 
@@ -18,7 +18,7 @@ except ImportError as exc:
 
 from . import base
 from ..storage.base import Storage
-from ..typehints import AsyncFunction
+from ..typehints import AsyncFunction, HttpSend
 from ..entities import Request, Response, CaseInsensitiveDict
 from ..parser.httptools_protocol import Protocol as LLHttpProtocol
 
@@ -76,23 +76,36 @@ class AsyncioServerProtocol(asyncio.Protocol):
             callback=self.on_message_complete,
             parser=self.parser,
             protocol=self.protocol,
-            # I really don't know why linter thinks that TCPTransport
-            # doesn't provide `write()` method but I haven't tried this
-            # without uvloop, so don't know whether this will work for
-            # vanilla asyncio transport
-            response_client=transport.write,  # noqa
+            response_client=self.send_response,
             request=self.request_obj,
             response=self.response_obj
         ))
 
+    def send_response(self, data: Union[bytes, Iterable[bytes]]) -> None:
+        """
+        Rendered response is written as it is. Parts of response are passed
+        to writelines(), so uvloop sends all of them with a single writev()
+        """
+
+        # I really don't know why linter thinks that TCPTransport
+        # doesn't provide `write()` method but I haven't tried this
+        # without uvloop, so don't know whether this will work for
+        # vanilla asyncio transport
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self.transport.write(data)  # noqa
+        else:
+            self.transport.writelines(data)  # noqa
+
     def data_received(self, data: bytes) -> None:
-        asyncio.create_task(self.requests_queue.put(data))
+        # queue is unbounded, so putting never blocks and there is no need
+        # to create a task for every received block
+        self.requests_queue.put_nowait(data)
 
     def connection_lost(self, _) -> None:
         # connection_lost callback receives one positional argument - Exception
         # object. But we actually don't need it, as we anyway doesn't care,
         # it's client's problem
-        asyncio.create_task(self.requests_queue.put(CLIENT_DISCONNECTED))
+        self.requests_queue.put_nowait(CLIENT_DISCONNECTED)
         self.transport.close()
 
 
@@ -140,7 +153,7 @@ async def client_runner(requests_queue: asyncio.Queue,
                         callback: AsyncFunction,
                         parser: HttpRequestParser,
                         protocol: LLHttpProtocol,
-                        response_client: Callable[[bytes], None],
+                        response_client: HttpSend,
                         request: Request,
                         response: Response) -> NoReturn:
     while True:
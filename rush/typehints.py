@@ -1,5 +1,5 @@
 import socket
-from typing import Callable, Awaitable, BinaryIO, Union, NewType, Protocol
+from typing import Callable, Awaitable, BinaryIO, Union, NewType, Protocol, Iterable
 
 AsyncFunction = Callable[..., Awaitable]
 Path = str
@@ -13,6 +13,8 @@ HTTPMethods = set
 HTTPVersion = str
 Connection = socket.socket
 HttpResponseCallback = Callable
+# sends either already rendered response, or its parts all at once
+HttpSend = Callable[[Union[bytes, Iterable[bytes]]], None]
 Nothing = NewType('Nothing', None)
 
 
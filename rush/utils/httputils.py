@@ -40,9 +40,31 @@ def render_http_response(protocol: bytes,
                                     by len(body)
     """
 
+    return render_http_response_head(
+        protocol=protocol,
+        code=code,
+        status_code=status_code,
+        headers=headers,
+        content_length=len(body) if count_content_length else None
+    ) + body
+
+
+def render_http_response_head(protocol: bytes,
+                              code: int,
+                              status_code: Optional[bytes],
+                              headers: Union[dict, bytes],
+                              content_length: Optional[int] = None) -> bytes:
+    """
+    Same as render_http_response(), but renders only status line and headers,
+    so body can be sent right after it without copying it into the response
+
+    Arguments are the same, except content_length - if not None and headers aren't
+    already rendered, content-length header will be replaced by it
+    """
+
     if not isinstance(headers, bytes):
-        if count_content_length:
-            headers['content-length'] = len(body)
+        if content_length is not None:
+            headers['content-length'] = content_length
 
         headers = '\r\n'.join(
             f'{key}: {value}' for key, value in headers.items()
@@ -56,7 +78,7 @@ def render_http_response(protocol: bytes,
 
     # I'm not using format_headers() function here just to avoid useless calling
     # as everybody knows, functions' calls are a bit expensive in CPython
-    return b'HTTP/%s %d %s\r\n%s\r\n\r\n%s' % (protocol, code, status_description, headers, body)
+    return b'HTTP/%s %d %s\r\n%s\r\n\r\n' % (protocol, code, status_description, headers)
 
 
 def render_http_request(method: bytes,
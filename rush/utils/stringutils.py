@@ -1,7 +1,7 @@
-from typing import Union
+from typing import Union, Optional
 
 
-def make_sure_bytes_or_none(obj: Union[str, bytes]) -> Union[bytes, None]:
+def make_sure_bytes_or_none(obj: Optional[Union[str, bytes]]) -> Union[bytes, None]:
     if obj is None:
         return None
 
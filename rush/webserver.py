@@ -1,3 +1,4 @@
+import gc
 import os
 import socket
 import logging
@@ -77,18 +78,41 @@ class WebServer:
             raise TypeError(f'{dp} object must be inherited from '
                             'rush.dispatcher.base.Dispatcher object!')
 
-        children_count = self._get_children_count(self.settings.processes)
+        # no collections until workers are forked: they would free objects
+        # in the middle of pages that are going to be shared, and the holes
+        # would be filled (and so copied) by every worker. Application may
+        # have disabled gc by itself, so workers restore the state it was in
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
 
-        if children_count != self.settings.processes:
-            self.logger.info(f'setting processes count to {children_count}')
+        try:
+            # routes and middlewares won't change anymore, so dispatcher
+            # prepares them once here instead of doing it in every worker
+            dp.freeze()
 
-        self.logger.debug(f'forking {children_count} times')
-        self._children = self._do_forks(n=children_count)
+            children_count = self._get_children_count(self.settings.processes)
+
+            if children_count != self.settings.processes:
+                self.logger.info(f'setting processes count to {children_count}')
+
+            # everything allocated so far (dispatcher with its handlers and chains
+            # included) is moved to the permanent generation. Otherwise collections
+            # in workers would write to these objects' headers, and every touched
+            # page would be copied to each of workers instead of being shared
+            gc.freeze()
+
+            self.logger.debug(f'forking {children_count} times')
+            self._children = self._do_forks(n=children_count)
+        except BaseException:
+            if gc_was_enabled:
+                gc.enable()
+
+            raise
 
         if self._children is not None:
             self.logger.debug('children has been spawned')
 
-        self._server_worker(dp)
+        self._server_worker(dp, enable_gc=gc_was_enabled)
 
     def _get_children_count(self, raw_count: Optional[int]) -> int:
         """
@@ -125,11 +149,17 @@ class WebServer:
 
         return spawned_children
 
-    def _server_worker(self, dp: BaseDispatcher):
+    def _server_worker(self, dp: BaseDispatcher, enable_gc: bool = True):
         """
         Finally, we're in our brand-new process that belongs only to us, hohoho
+
+        enable_gc is whether gc was enabled before run() disabled it for forking
         """
 
+        # objects inherited from parent are frozen, so collections won't touch them
+        if enable_gc:
+            gc.enable()
+
         self.logger.disabled = not self._is_parent()
 
         sock = socket.socket()
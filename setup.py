@@ -1,4 +1,4 @@
-from os import listdir, path
+from os import listdir, path, environ
 from setuptools import setup, find_packages
 
 with open("README.md", "r", encoding="utf8") as long_desc_fd:
@@ -35,6 +35,26 @@ for nonpython_files_dir in nonpython_files_dirs:
         if path.isfile(nonpython_files_dir + file):
             nonpython_files.append(nonpython_files_dir + file)
 
+"""
+Dispatcher's hot path may be compiled with mypyc. It's optional: set RUSH_MYPYC=1
+to build it, otherwise (or if mypyc isn't installed) pure python package is built.
+Only internal modules are compiled: compiled classes can't be subclassed by
+interpreted ones, and their instances can't get arbitrary attributes
+"""
+ext_modules = []
+
+if environ.get('RUSH_MYPYC') == '1':
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print('RUSH_MYPYC is set, but mypyc is not installed; building pure python package')
+    else:
+        ext_modules = mypycify([
+            # only compiled modules have to be type-checked strictly
+            '--follow-imports=silent',
+            'rush/dispatcher/_routing.py'
+        ])
+
 setup(
     name="rush",
     version=version,
@@ -46,6 +66,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     data_files=[('', nonpython_files)],
+    ext_modules=ext_modules,
     project_urls={
         "Bug Tracker": "https://github.com/fakefloordiv/rush/issues",
     },